@@ -1,5 +1,6 @@
 import os
 import uuid
+from django.db.models import Q
 from django.utils.text import slugify
 
 
@@ -11,12 +12,19 @@ def generate_unique_slug(instance, field_name, slug_field_name='slug'):
     if not slug:
         slug = str(uuid.uuid4())[:8]
     
-    # Check if slug already exists
+    # Fetch the slug and its numbered variants in one query
     model = instance.__class__
+    taken = set(
+        model.objects.filter(
+            Q(**{slug_field_name: slug}) | Q(**{f'{slug_field_name}__startswith': f'{slug}-'})
+        )
+        .exclude(pk=instance.pk)
+        .values_list(slug_field_name, flat=True)
+    )
     original_slug = slug
     counter = 1
     
-    while model.objects.filter(**{slug_field_name: slug}).exclude(pk=instance.pk).exists():
+    while slug in taken:
         slug = f"{original_slug}-{counter}"
         counter += 1
     
@@ -30,3 +38,15 @@ def get_file_path(instance, filename):
     ext = filename.split('.')[-1]
     filename = f"{uuid.uuid4()}.{ext}"
     return os.path.join('uploads', filename)
+
+
+FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+def format_file_size(size):
+    """
+    Return a human readable file size, e.g. ``1.5 MB``.
+    """
+    # Each unit step is 2**10, so the bit length picks the unit without a loop
+    unit_index = min(max(size.bit_length() - 1, 0) // 10, len(FILE_SIZE_UNITS) - 1)
+    return f'{size / (1 << (10 * unit_index)):.1f} {FILE_SIZE_UNITS[unit_index]}'
@@ -5,11 +5,24 @@ from django.utils.text import slugify
 from django.core.validators import FileExtensionValidator
 from taggit.managers import TaggableManager
 from core.models import TimeStampedModel
-from core.utils import generate_unique_slug, get_file_path
+from core.utils import format_file_size, generate_unique_slug, get_file_path
 import bleach
 
 User = get_user_model()
 
+# MIME types used to classify and preview attachments
+DOCUMENT_MIME_TYPES = frozenset({
+    'application/pdf',
+    'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+})
+ARCHIVE_MIME_TYPES = frozenset({
+    'application/zip',
+    'application/x-rar-compressed',
+    'application/x-7z-compressed',
+})
+PREVIEWABLE_MIME_TYPES = frozenset({'text/plain', 'text/html', 'application/pdf'})
+
 
 class Notebook(TimeStampedModel):
     """Notebook model to organize notes."""
@@ -41,9 +54,20 @@ class Notebook(TimeStampedModel):
         return reverse('notes:notebook_detail', kwargs={'slug': self.slug})
     
     def get_note_count(self):
+        # Prefer the ``note_count`` annotation when the queryset provides one
+        if hasattr(self, 'note_count'):
+            return self.note_count
         return self.notes.count()
 
 
+class NoteQuerySet(models.QuerySet):
+    """Custom queryset for notes."""
+    
+    def with_related(self):
+        """Fetch the notebook and tags needed to render note cards."""
+        return self.select_related('notebook').prefetch_related('tags')
+
+
 class Note(TimeStampedModel):
     """Main note model."""
     
@@ -66,6 +90,8 @@ class Note(TimeStampedModel):
     # Tagging support
     tags = TaggableManager(blank=True)
     
+    objects = NoteQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-is_pinned', '-modified']
         unique_together = ['user', 'slug']
@@ -77,8 +103,9 @@ class Note(TimeStampedModel):
         if not self.slug:
             self.slug = generate_unique_slug(self, 'title')
         
-        # Clean HTML content
-        if self.content:
+        # Clean HTML content (skipped when only other columns are being written)
+        update_fields = kwargs.get('update_fields')
+        if self.content and (update_fields is None or 'content' in update_fields):
             allowed_tags = [
                 'p', 'br', 'strong', 'em', 'u', 'strike', 'ul', 'ol', 'li',
                 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'code',
@@ -126,6 +153,16 @@ class NoteAttachment(TimeStampedModel):
         ('other', 'Other'),
     ]
     
+    # Font Awesome icon per attachment type
+    TYPE_ICONS = {
+        'image': 'fas fa-image',
+        'document': 'fas fa-file-alt',
+        'audio': 'fas fa-music',
+        'video': 'fas fa-video',
+        'archive': 'fas fa-file-archive',
+        'other': 'fas fa-file',
+    }
+    
     note = models.ForeignKey(Note, on_delete=models.CASCADE, related_name='attachments')
     file = models.FileField(
         upload_to=get_file_path,
@@ -191,9 +228,9 @@ class NoteAttachment(TimeStampedModel):
             return 'audio'
         elif self.file_type.startswith('video/'):
             return 'video'
-        elif self.file_type in ['application/pdf', 'application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']:
+        elif self.file_type in DOCUMENT_MIME_TYPES:
             return 'document'
-        elif self.file_type in ['application/zip', 'application/x-rar-compressed', 'application/x-7z-compressed']:
+        elif self.file_type in ARCHIVE_MIME_TYPES:
             return 'archive'
         else:
             return 'other'
@@ -230,30 +267,15 @@ class NoteAttachment(TimeStampedModel):
     
     def get_file_size_human(self):
         """Return human readable file size."""
-        size = self.file_size
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f'{size:.1f} {unit}'
-            size /= 1024.0
-        return f'{size:.1f} TB'
+        return format_file_size(self.file_size)
     
     def get_file_icon(self):
         """Return appropriate icon for file type."""
-        icons = {
-            'image': 'fas fa-image',
-            'document': 'fas fa-file-alt',
-            'audio': 'fas fa-music',
-            'video': 'fas fa-video',
-            'archive': 'fas fa-file-archive',
-            'other': 'fas fa-file',
-        }
-        return icons.get(self.attachment_type, 'fas fa-file')
+        return self.TYPE_ICONS.get(self.attachment_type, 'fas fa-file')
     
     def is_previewable(self):
         """Check if file can be previewed in browser."""
-        return self.is_image or self.file_type in [
-            'text/plain', 'text/html', 'application/pdf'
-        ]
+        return self.is_image or self.file_type in PREVIEWABLE_MIME_TYPES
 
 
 class SharedNote(TimeStampedModel):
@@ -309,6 +331,21 @@ class Todo(TimeStampedModel):
         ('cancelled', 'Cancelled'),
     ]
     
+    # Bootstrap color classes for priority and status badges
+    PRIORITY_COLORS = {
+        'low': 'success',
+        'medium': 'info',
+        'high': 'warning',
+        'urgent': 'danger',
+    }
+    
+    STATUS_COLORS = {
+        'pending': 'secondary',
+        'in_progress': 'primary',
+        'completed': 'success',
+        'cancelled': 'danger',
+    }
+    
     note = models.ForeignKey(Note, on_delete=models.CASCADE, related_name='todos', null=True, blank=True)
     user = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='todos', default=1)
     title = models.CharField(max_length=200)
@@ -368,20 +405,8 @@ class Todo(TimeStampedModel):
     
     def get_priority_color(self):
         """Get Bootstrap color class for priority."""
-        colors = {
-            'low': 'success',
-            'medium': 'info',
-            'high': 'warning',
-            'urgent': 'danger',
-        }
-        return colors.get(self.priority, 'secondary')
+        return self.PRIORITY_COLORS.get(self.priority, 'secondary')
     
     def get_status_color(self):
         """Get Bootstrap color class for status."""
-        colors = {
-            'pending': 'secondary',
-            'in_progress': 'primary',
-            'completed': 'success',
-            'cancelled': 'danger',
-        }
-        return colors.get(self.status, 'secondary')
+        return self.STATUS_COLORS.get(self.status, 'secondary')
@@ -12,6 +12,9 @@ from .models import Note, Notebook, NoteAttachment, SharedNote, Todo
 from .forms import NoteForm, NotebookForm, NoteSearchForm, NoteMoveForm, NoteCopyForm, TodoForm, TodoQuickForm, TodoBulkForm, AttachmentForm, MultipleAttachmentForm, StandaloneTodoForm
 import json
 
+# Read size used when streaming attachments to the client
+ATTACHMENT_BLOCK_SIZE = 1024 * 1024
+
 
 class DashboardView(LoginRequiredMixin, ListView):
     """Main dashboard view showing user's notes."""
@@ -24,42 +27,35 @@ class DashboardView(LoginRequiredMixin, ListView):
         return Note.objects.filter(
             user=self.request.user,
             is_archived=False
-        ).select_related('notebook').prefetch_related('tags')
+        ).with_related()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
         
         # Note Statistics
-        total_notes = user.notes.count()
+        note_stats = user.notes.aggregate(
+            total_notes=Count('id'),
+            pinned_notes=Count('id', filter=Q(is_pinned=True)),
+            archived_notes=Count('id', filter=Q(is_archived=True)),
+        )
         total_notebooks = user.notebooks.count()
-        pinned_notes = user.notes.filter(is_pinned=True).count()
-        archived_notes = user.notes.filter(is_archived=True).count()
         
         # Todo Statistics (include both note-based and standalone todos)
-        user_todos = Todo.objects.filter(user=user)
-        total_todos = user_todos.count()
-        completed_todos = user_todos.filter(is_completed=True).count()
-        pending_todos = user_todos.filter(status='pending').count()
-        overdue_todos = user_todos.filter(
-            due_date__lt=timezone.now(),
-            is_completed=False
-        ).count()
+        todo_stats = Todo.objects.filter(user=user).aggregate(
+            total_todos=Count('id'),
+            completed_todos=Count('id', filter=Q(is_completed=True)),
+            pending_todos=Count('id', filter=Q(status='pending')),
+            overdue_todos=Count('id', filter=Q(due_date__lt=timezone.now(), is_completed=False)),
+            standalone_todos=Count('id', filter=Q(note__isnull=True)),
+        )
         
         # Statistics
-        standalone_todos = user.todos.filter(note__isnull=True).count()
+        context.update(note_stats)
+        context.update(todo_stats)
         context.update({
-            'total_notes': total_notes,
             'total_notebooks': total_notebooks,
-            'pinned_notes': pinned_notes,
-            'archived_notes': archived_notes,
-            'total_todos': total_todos,
-            'completed_todos': completed_todos,
-            'pending_todos': pending_todos,
-            'overdue_todos': overdue_todos,
-            'standalone_todos': standalone_todos,
-            'recent_notes': user.notes.order_by('-modified')[:5],
-            'notebooks': user.notebooks.all()[:10],
+            'notebooks': user.notebooks.annotate(note_count=Count('notes')).order_by('name')[:10],
         })
         
         return context
@@ -75,7 +71,7 @@ class NoteDetailView(LoginRequiredMixin, DetailView):
         return Note.objects.filter(
             Q(user=self.request.user) | 
             Q(shares__shared_with=self.request.user)
-        ).select_related('user', 'notebook').prefetch_related('tags', 'attachments')
+        ).with_related().select_related('user').prefetch_related('attachments')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -137,9 +133,10 @@ class NoteUpdateView(LoginRequiredMixin, UpdateView):
         return context
     
     def form_valid(self, form):
-        # Handle AJAX auto-save requests
+        # Handle AJAX auto-save requests; skip the write when nothing changed
         if self.request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            form.save()
+            if form.has_changed():
+                form.save()
             return JsonResponse({'success': True})
         
         response = super().form_valid(form)
@@ -189,9 +186,9 @@ class NotebookDetailView(LoginRequiredMixin, DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        notebook = self.get_object()
+        notebook = self.object
         
-        notes = notebook.notes.filter(is_archived=False).order_by('-modified')
+        notes = notebook.notes.filter(is_archived=False).prefetch_related('tags').order_by('-modified')
         paginator = Paginator(notes, 12)
         page_number = self.request.GET.get('page')
         context['notes'] = paginator.get_page(page_number)
@@ -244,7 +241,7 @@ def search_notes(request):
                 Q(title__icontains=query) | 
                 Q(content__icontains=query) |
                 Q(tags__name__icontains=query)
-            ).distinct().select_related('notebook').prefetch_related('tags')
+            ).distinct().with_related()
     
     paginator = Paginator(notes, 12)
     page_number = request.GET.get('page')
@@ -254,7 +251,7 @@ def search_notes(request):
         'form': form,
         'notes': notes_page,
         'query': query,
-        'total_results': notes.count() if query else 0,
+        'total_results': paginator.count if query else 0,
     }
     
     return render(request, 'notes/search_results.html', context)
@@ -265,7 +262,7 @@ def toggle_pin_note(request, slug):
     """Toggle note pin status."""
     note = get_object_or_404(Note, slug=slug, user=request.user)
     note.is_pinned = not note.is_pinned
-    note.save()
+    note.save(update_fields=['is_pinned', 'modified'])
     
     status = 'pinned' if note.is_pinned else 'unpinned'
     messages.success(request, f'Note {status} successfully!')
@@ -278,7 +275,7 @@ def toggle_archive_note(request, slug):
     """Toggle note archive status."""
     note = get_object_or_404(Note, slug=slug, user=request.user)
     note.is_archived = not note.is_archived
-    note.save()
+    note.save(update_fields=['is_archived', 'modified'])
     
     status = 'archived' if note.is_archived else 'restored'
     messages.success(request, f'Note {status} successfully!')
@@ -292,7 +289,7 @@ def archived_notes(request):
     notes = Note.objects.filter(
         user=request.user,
         is_archived=True
-    ).select_related('notebook').prefetch_related('tags')
+    ).with_related()
     
     paginator = Paginator(notes, 12)
     page_number = request.GET.get('page')
@@ -318,7 +315,7 @@ def move_note(request, slug):
             old_notebook = note.notebook
             
             note.notebook = new_notebook
-            note.save()
+            note.save(update_fields=['notebook', 'modified'])
             
             messages.success(
                 request, 
@@ -352,9 +349,8 @@ def copy_note(request, slug):
             new_note.is_archived = False  # New copies are not archived
             new_note.save()
             
-            # Copy tags from original note
-            for tag in original_note.tags.all():
-                new_note.tags.add(tag)
+            # Copy tags from original note in one bulk add
+            new_note.tags.add(*original_note.tags.all())
             
             messages.success(
                 request, 
@@ -380,7 +376,7 @@ def copy_note(request, slug):
 def todo_list(request, note_slug):
     """List todos for a specific note."""
     note = get_object_or_404(Note, slug=note_slug, user=request.user)
-    todos = note.todos.all()
+    todos = note.todos.prefetch_related('tags')
     
     # Filter by status
     status_filter = request.GET.get('status', 'all')
@@ -490,7 +486,7 @@ def todo_toggle(request, note_slug, todo_id):
     todo = get_object_or_404(Todo, id=todo_id, note=note)
     
     todo.is_completed = not todo.is_completed
-    todo.save()
+    todo.save(update_fields=['is_completed', 'completed_at', 'status', 'modified'])
     
     status = 'completed' if todo.is_completed else 'pending'
     messages.success(request, f'Todo "{todo.title}" marked as {status}!')
@@ -546,20 +542,21 @@ def todo_bulk_action(request, note_slug):
             todos = Todo.objects.filter(id__in=todo_ids, note=note)
             
             if action == 'complete':
-                todos.update(is_completed=True, status='completed')
-                message = f'{todos.count()} todos marked as completed!'
+                count = todos.update(is_completed=True, status='completed')
+                message = f'{count} todos marked as completed!'
             elif action == 'pending':
-                todos.update(is_completed=False, status='pending')
-                message = f'{todos.count()} todos marked as pending!'
+                count = todos.update(is_completed=False, status='pending')
+                message = f'{count} todos marked as pending!'
             elif action == 'in_progress':
-                todos.update(status='in_progress')
-                message = f'{todos.count()} todos marked as in progress!'
+                count = todos.update(status='in_progress')
+                message = f'{count} todos marked as in progress!'
             elif action == 'cancelled':
-                todos.update(status='cancelled')
-                message = f'{todos.count()} todos marked as cancelled!'
+                count = todos.update(status='cancelled')
+                message = f'{count} todos marked as cancelled!'
             elif action == 'delete':
-                count = todos.count()
-                todos.delete()
+                # delete() also counts cascaded tag links; report todos only
+                _, deleted = todos.delete()
+                count = deleted.get(Todo._meta.label, 0)
                 message = f'{count} todos deleted!'
             
             messages.success(request, message)
@@ -651,7 +648,9 @@ def attachment_download(request, note_slug, attachment_id):
     attachment = get_object_or_404(NoteAttachment, id=attachment_id, note=note)
     
     from django.http import FileResponse
-    return FileResponse(attachment.file, as_attachment=True, filename=attachment.original_name)
+    response = FileResponse(attachment.file, as_attachment=True, filename=attachment.original_name)
+    response.block_size = ATTACHMENT_BLOCK_SIZE
+    return response
 
 
 @login_required
@@ -725,9 +724,10 @@ def attachment_serve(request, note_slug, attachment_id):
         response = FileResponse(
             attachment.file,
             content_type=attachment.file_type,
-            as_attachment=False
+            as_attachment=False,
+            filename=attachment.original_name
         )
-        response['Content-Disposition'] = f'inline; filename="{attachment.original_name}"'
+        response.block_size = ATTACHMENT_BLOCK_SIZE
         return response
     except Exception:
         raise Http404("File not found")
@@ -739,7 +739,7 @@ def todo_dashboard(request):
     from django.utils import timezone
     
     # Get all todos for the user (both note-based and standalone)
-    todos = Todo.objects.filter(user=request.user).select_related('note', 'note__notebook')
+    todos = Todo.objects.filter(user=request.user).select_related('note', 'note__notebook').prefetch_related('tags')
     
     # Get filter parameters
     notebook_filter = request.GET.get('notebook', 'all')
@@ -794,23 +794,26 @@ def todo_dashboard(request):
     notebooks = Notebook.objects.filter(user=request.user).order_by('name')
     notes = Note.objects.filter(user=request.user).order_by('title')
     
-    # Get statistics
-    total_todos = todos.count()
-    completed_todos = todos.filter(is_completed=True).count()
-    pending_todos = todos.filter(status='pending').count()
-    in_progress_todos = todos.filter(status='in_progress').count()
-    overdue_todos = todos.filter(
-        due_date__lt=timezone.now(),
-        is_completed=False
-    ).count()
-    archived_notes = Note.objects.filter(user=request.user, is_archived=True).count()
-    standalone_todos = Todo.objects.filter(user=request.user, note__isnull=True).count()
-    
     # Pagination
     paginator = Paginator(todos, 20)
     page_number = request.GET.get('page')
     todos_page = paginator.get_page(page_number)
     
+    # Get statistics (the paginator has already counted the filtered todos)
+    total_todos = paginator.count
+    todo_stats = todos.aggregate(
+        completed=Count('id', filter=Q(is_completed=True)),
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        overdue=Count('id', filter=Q(due_date__lt=timezone.now(), is_completed=False)),
+    )
+    completed_todos = todo_stats['completed']
+    pending_todos = todo_stats['pending']
+    in_progress_todos = todo_stats['in_progress']
+    overdue_todos = todo_stats['overdue']
+    archived_notes = Note.objects.filter(user=request.user, is_archived=True).count()
+    standalone_todos = Todo.objects.filter(user=request.user, note__isnull=True).count()
+    
     context = {
         'todos': todos_page,
         'notebooks': notebooks,
@@ -841,7 +844,7 @@ def standalone_todo_list(request):
     todos = Todo.objects.filter(
         user=request.user,
         note__isnull=True
-    ).order_by('-created')
+    ).prefetch_related('tags').order_by('-created')
     
     # Filtering
     status_filter = request.GET.get('status', '')
@@ -874,15 +877,18 @@ def standalone_todo_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Statistics
-    total_todos = todos.count()
-    completed_todos = todos.filter(status='completed').count()
-    pending_todos = todos.filter(status='pending').count()
-    in_progress_todos = todos.filter(status='in_progress').count()
-    overdue_todos = todos.filter(
-        due_date__lt=timezone.now(),
-        status__in=['pending', 'in_progress']
-    ).count()
+    # Statistics (the paginator has already counted the filtered todos)
+    total_todos = paginator.count
+    todo_stats = todos.aggregate(
+        completed=Count('id', filter=Q(status='completed')),
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        overdue=Count('id', filter=Q(due_date__lt=timezone.now(), status__in=['pending', 'in_progress'])),
+    )
+    completed_todos = todo_stats['completed']
+    pending_todos = todo_stats['pending']
+    in_progress_todos = todo_stats['in_progress']
+    overdue_todos = todo_stats['overdue']
     
     context = {
         'todos': page_obj,
@@ -956,7 +962,7 @@ def standalone_todo_toggle(request, pk):
     
     if request.method == 'POST':
         todo.is_completed = not todo.is_completed
-        todo.save()
+        todo.save(update_fields=['is_completed', 'completed_at', 'status', 'modified'])
         
         return JsonResponse({
             'success': True,
@@ -1009,11 +1015,12 @@ class NotebookDeleteView(LoginRequiredMixin, DeleteView):
     success_url = reverse_lazy('notes:notebook_list')
     
     def get_queryset(self):
-        return Notebook.objects.filter(user=self.request.user)
+        # The default notebook receives the moved notes, so it can't be deleted
+        return Notebook.objects.filter(user=self.request.user, is_default=False)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        notebook = self.get_object()
+        notebook = self.object
         
         # Get notes that will be moved to default notebook
         notes_to_move = notebook.notes.all()
@@ -1037,12 +1044,12 @@ class NotebookDeleteView(LoginRequiredMixin, DeleteView):
         })
         return context
     
-    def delete(self, request, *args, **kwargs):
-        notebook = self.get_object()
+    def form_valid(self, form):
+        notebook = self.object
         
         # Get or create default notebook
         default_notebook, created = Notebook.objects.get_or_create(
-            user=request.user,
+            user=self.request.user,
             is_default=True,
             defaults={
                 'name': 'Default',
@@ -1051,19 +1058,13 @@ class NotebookDeleteView(LoginRequiredMixin, DeleteView):
             }
         )
         
-        # Move all notes from this notebook to default notebook
-        notes_to_move = notebook.notes.all()
-        for note in notes_to_move:
-            note.notebook = default_notebook
-            note.save()
-        
-        # Delete the notebook
-        notebook_name = notebook.name
-        notebook.delete()
+        # Move all notes from this notebook to default notebook in a single UPDATE
+        moved_count = notebook.notes.update(notebook=default_notebook, modified=timezone.now())
         
         messages.success(
-            request, 
-            f'Notebook "{notebook_name}" has been deleted. {notes_to_move.count()} notes have been moved to the default notebook.'
+            self.request, 
+            f'Notebook "{notebook.name}" has been deleted. {moved_count} notes have been moved to the default notebook.'
         )
         
-        return super().delete(request, *args, **kwargs)
+        # Delete the notebook
+        return super().form_valid(form)
@@ -5,6 +5,25 @@ from .models import VaultConfig, VaultCredential, VaultSecureNote, VaultFile, Va
 from .session import VaultSessionManager
 
 
+def get_item_counts(request):
+    """
+    Return vault item counts for the current user.
+
+    Counts are memoized on the request so views and the context processor
+    share a single set of COUNT queries per request.
+    """
+    counts = getattr(request, '_vault_item_counts', None)
+    if counts is None:
+        counts = {
+            'credential': VaultCredential.objects.filter(user=request.user).count(),
+            'note': VaultSecureNote.objects.filter(user=request.user).count(),
+            'file': VaultFile.objects.filter(user=request.user).count(),
+            'apikey': VaultAPIKey.objects.filter(user=request.user).count(),
+        }
+        request._vault_item_counts = counts
+    return counts
+
+
 def vault_stats(request):
     """
     Add vault statistics to template context.
@@ -26,10 +45,11 @@ def vault_stats(request):
             context['vault_is_unlocked'] = VaultSessionManager.is_vault_unlocked(request)
 
             # Get vault item counts
-            context['vault_credential_count'] = VaultCredential.objects.filter(user=request.user).count()
-            context['vault_note_count'] = VaultSecureNote.objects.filter(user=request.user).count()
-            context['vault_file_count'] = VaultFile.objects.filter(user=request.user).count()
-            context['vault_apikey_count'] = VaultAPIKey.objects.filter(user=request.user).count()
+            counts = get_item_counts(request)
+            context['vault_credential_count'] = counts['credential']
+            context['vault_note_count'] = counts['note']
+            context['vault_file_count'] = counts['file']
+            context['vault_apikey_count'] = counts['apikey']
             context['vault_total_items'] = (
                 context['vault_credential_count'] +
                 context['vault_note_count'] +
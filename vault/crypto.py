@@ -6,6 +6,7 @@ functionality for the vault feature using industry-standard algorithms.
 """
 
 import base64
+import hashlib
 import secrets
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -157,6 +158,22 @@ class VaultCryptoService:
         f = Fernet(dek)
         return f.decrypt(encrypted_content)
 
+    @staticmethod
+    def calculate_checksum(file_content: bytes) -> str:
+        """
+        Calculate SHA-256 checksum of file contents.
+
+        hashlib's sha256 is backed by OpenSSL, which uses the CPU's SHA
+        extensions when available, and hashes the whole buffer in one call.
+
+        Args:
+            file_content: Binary file content
+
+        Returns:
+            Hex-encoded SHA-256 digest
+        """
+        return hashlib.sha256(file_content).hexdigest()
+
     @staticmethod
     def hash_master_password(
         master_password: str,
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.6 on 2026-10-16 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='vaultapikey',
+            options={'ordering': ['-created'], 'verbose_name': 'Vault API Key', 'verbose_name_plural': 'Vault API Keys'},
+        ),
+        migrations.AlterModelOptions(
+            name='vaultcredential',
+            options={'ordering': ['-created'], 'verbose_name': 'Vault Credential', 'verbose_name_plural': 'Vault Credentials'},
+        ),
+        migrations.AlterModelOptions(
+            name='vaultfile',
+            options={'ordering': ['-created'], 'verbose_name': 'Vault File', 'verbose_name_plural': 'Vault Files'},
+        ),
+        migrations.AlterModelOptions(
+            name='vaultsecurenote',
+            options={'ordering': ['-created'], 'verbose_name': 'Vault Secure Note', 'verbose_name_plural': 'Vault Secure Notes'},
+        ),
+        migrations.AddIndex(
+            model_name='vaultapikey',
+            index=models.Index(fields=['user', '-created'], name='vault_api_k_user_id_ed5071_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaultapikey',
+            index=models.Index(condition=models.Q(('is_favorite', True)), fields=['user'], name='vaultapikey_favorites_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaultcredential',
+            index=models.Index(fields=['user', '-created'], name='vault_crede_user_id_897eef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaultcredential',
+            index=models.Index(condition=models.Q(('is_favorite', True)), fields=['user'], name='vaultcredential_favorites_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaultfile',
+            index=models.Index(fields=['user', '-created'], name='vault_files_user_id_f61328_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaultfile',
+            index=models.Index(condition=models.Q(('is_favorite', True)), fields=['user'], name='vaultfile_favorites_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaultsecurenote',
+            index=models.Index(fields=['user', '-created'], name='vault_secur_user_id_1e1d46_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaultsecurenote',
+            index=models.Index(condition=models.Q(('is_favorite', True)), fields=['user'], name='vaultsecurenote_favorites_idx'),
+        ),
+    ]
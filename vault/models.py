@@ -12,10 +12,12 @@ This module defines all database models for the vault feature including:
 
 import uuid
 from django.db import models
+from django.db.models import F, Q
 from django.contrib.auth import get_user_model
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
 from core.models import TimeStampedModel
+from core.utils import format_file_size
 
 User = get_user_model()
 
@@ -110,10 +112,19 @@ class VaultConfig(TimeStampedModel):
 
     def reset_failed_attempts(self):
         """Reset failed attempts counter after successful unlock."""
+        if not self.failed_attempts and self.locked_until is None:
+            return
         self.failed_attempts = 0
         self.locked_until = None
         self.save(update_fields=['failed_attempts', 'locked_until'])
 
+    def record_failed_attempt(self):
+        """Atomically increment failed attempts counter after failed unlock."""
+        VaultConfig.objects.filter(pk=self.pk).update(
+            failed_attempts=F('failed_attempts') + 1
+        )
+        self.refresh_from_db(fields=['failed_attempts'])
+
 
 class VaultItem(TimeStampedModel):
     """
@@ -162,7 +173,12 @@ class VaultItem(TimeStampedModel):
         ordering = ['-created']
         indexes = [
             models.Index(fields=['user', '-created']),
-            models.Index(fields=['user', 'is_favorite']),
+            # Partial index: only the (few) favorited rows are indexed
+            models.Index(
+                fields=['user'],
+                name='%(class)s_favorites_idx',
+                condition=Q(is_favorite=True)
+            ),
         ]
 
     def __str__(self):
@@ -219,7 +235,7 @@ class VaultCredential(VaultItem):
         help_text="Password strength (0-4)"
     )
 
-    class Meta:
+    class Meta(VaultItem.Meta):
         db_table = 'vault_credentials'
         verbose_name = 'Vault Credential'
         verbose_name_plural = 'Vault Credentials'
@@ -247,7 +263,7 @@ class VaultSecureNote(VaultItem):
         choices=CONTENT_TYPES
     )
 
-    class Meta:
+    class Meta(VaultItem.Meta):
         db_table = 'vault_secure_notes'
         verbose_name = 'Vault Secure Note'
         verbose_name_plural = 'Vault Secure Notes'
@@ -292,19 +308,14 @@ class VaultFile(VaultItem):
         help_text="SHA-256 checksum for integrity verification"
     )
 
-    class Meta:
+    class Meta(VaultItem.Meta):
         db_table = 'vault_files'
         verbose_name = 'Vault File'
         verbose_name_plural = 'Vault Files'
 
     def get_file_size_human(self):
         """Return human-readable file size."""
-        size = self.file_size
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f'{size:.1f} {unit}'
-            size /= 1024.0
-        return f'{size:.1f} TB'
+        return format_file_size(self.file_size)
 
 
 class VaultAPIKey(VaultItem):
@@ -351,7 +362,7 @@ class VaultAPIKey(VaultItem):
         help_text="Days before expiration to show warning"
     )
 
-    class Meta:
+    class Meta(VaultItem.Meta):
         db_table = 'vault_api_keys'
         verbose_name = 'Vault API Key'
         verbose_name_plural = 'Vault API Keys'
@@ -1,7 +1,6 @@
 """
 Views for vault operations.
 """
-import hashlib
 import mimetypes
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
@@ -13,6 +12,7 @@ from django.views.generic import (
 from django.urls import reverse_lazy, reverse
 from django.http import HttpResponse, Http404
 from django.utils import timezone
+from django.utils.http import content_disposition_header
 from django.db.models import Q
 from cryptography.fernet import InvalidToken
 
@@ -24,6 +24,7 @@ from .forms import (
     VaultSetupForm, VaultUnlockForm, VaultCredentialForm, VaultSecureNoteForm,
     VaultFileForm, VaultAPIKeyForm, VaultConfigForm, VaultSearchForm, VaultReAuthForm
 )
+from .context_processors import get_item_counts
 from .crypto import VaultCryptoService
 from .session import VaultSessionManager
 
@@ -240,14 +241,14 @@ class VaultUnlockView(LoginRequiredMixin, FormView):
                 return super().form_valid(form)
             else:
                 # Invalid password
-                vault_config.failed_attempts += 1
+                vault_config.record_failed_attempt()
 
                 # Check if we should lock the vault
                 if vault_config.failed_attempts >= vault_config.max_failed_attempts:
                     from django.conf import settings
                     lockout_minutes = settings.VAULT_SETTINGS.get('LOCKOUT_DURATION_MINUTES', 30)
                     vault_config.locked_until = timezone.now() + timezone.timedelta(minutes=lockout_minutes)
-                    vault_config.save()
+                    vault_config.save(update_fields=['locked_until'])
 
                     log_vault_action(self.request, 'failed_unlock', success=False)
                     from django.contrib.messages import constants as message_constants
@@ -258,7 +259,6 @@ class VaultUnlockView(LoginRequiredMixin, FormView):
                         extra_tags='danger'
                     )
                 else:
-                    vault_config.save()
                     remaining_attempts = vault_config.max_failed_attempts - vault_config.failed_attempts
                     log_vault_action(self.request, 'failed_unlock', success=False)
                     from django.contrib.messages import constants as message_constants
@@ -308,11 +308,12 @@ class VaultDashboardView(VaultRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         dek = VaultSessionManager.get_dek_from_session(self.request)
 
-        # Get counts
-        context['credential_count'] = VaultCredential.objects.filter(user=self.request.user).count()
-        context['note_count'] = VaultSecureNote.objects.filter(user=self.request.user).count()
-        context['file_count'] = VaultFile.objects.filter(user=self.request.user).count()
-        context['apikey_count'] = VaultAPIKey.objects.filter(user=self.request.user).count()
+        # Get counts (shared with the vault_stats context processor)
+        counts = get_item_counts(self.request)
+        context['credential_count'] = counts['credential']
+        context['note_count'] = counts['note']
+        context['file_count'] = counts['file']
+        context['apikey_count'] = counts['apikey']
 
         # Get recent items (decrypt names for display)
         recent_credentials = VaultCredential.objects.filter(user=self.request.user)[:5]
@@ -352,17 +353,20 @@ class CredentialListView(VaultRequiredMixin, ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        queryset = VaultCredential.objects.filter(user=self.request.user)
+        return VaultCredential.objects.filter(user=self.request.user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
         dek = VaultSessionManager.get_dek_from_session(self.request)
 
-        # Decrypt names for display
-        for item in queryset:
+        # Decrypt only the items on the current page
+        for item in context['object_list']:
             try:
                 item.decrypted_name = VaultCryptoService.decrypt_field(item.name, dek)
             except:
                 item.decrypted_name = '[Decryption Error]'
 
-        return queryset
+        return context
 
 
 class CredentialDetailView(VaultRequiredMixin, DetailView):
@@ -530,16 +534,20 @@ class SecureNoteListView(VaultRequiredMixin, ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        queryset = VaultSecureNote.objects.filter(user=self.request.user)
+        return VaultSecureNote.objects.filter(user=self.request.user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
         dek = VaultSessionManager.get_dek_from_session(self.request)
 
-        for item in queryset:
+        # Decrypt only the items on the current page
+        for item in context['object_list']:
             try:
                 item.decrypted_name = VaultCryptoService.decrypt_field(item.name, dek)
             except:
                 item.decrypted_name = '[Decryption Error]'
 
-        return queryset
+        return context
 
 
 class SecureNoteDetailView(VaultRequiredMixin, DetailView):
@@ -659,10 +667,14 @@ class FileListView(VaultRequiredMixin, ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        queryset = VaultFile.objects.filter(user=self.request.user)
+        return VaultFile.objects.filter(user=self.request.user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
         dek = VaultSessionManager.get_dek_from_session(self.request)
 
-        for item in queryset:
+        # Decrypt only the items on the current page
+        for item in context['object_list']:
             try:
                 item.decrypted_name = VaultCryptoService.decrypt_field(item.name, dek)
                 item.decrypted_filename = VaultCryptoService.decrypt_field(item.original_filename, dek)
@@ -670,7 +682,7 @@ class FileListView(VaultRequiredMixin, ListView):
                 item.decrypted_name = '[Decryption Error]'
                 item.decrypted_filename = '[Decryption Error]'
 
-        return queryset
+        return context
 
 
 class FileDetailView(VaultRequiredMixin, DetailView):
@@ -725,7 +737,7 @@ class FileCreateView(VaultRequiredMixin, CreateView):
         file_obj.encrypted_file_size = len(encrypted_content)
 
         # Calculate checksum of original file
-        file_obj.checksum_sha256 = hashlib.sha256(file_content).hexdigest()
+        file_obj.checksum_sha256 = VaultCryptoService.calculate_checksum(file_content)
 
         # Save encrypted file
         from django.core.files.base import ContentFile
@@ -770,14 +782,14 @@ def file_download(request, pk):
         decrypted_content = VaultCryptoService.decrypt_file(encrypted_content, dek)
 
         # Verify checksum
-        checksum = hashlib.sha256(decrypted_content).hexdigest()
+        checksum = VaultCryptoService.calculate_checksum(decrypted_content)
         if checksum != file_obj.checksum_sha256:
             messages.error(request, 'File integrity check failed!')
             return redirect('vault:file_detail', pk=pk)
 
         # Create response
         response = HttpResponse(decrypted_content, content_type=file_obj.mime_type)
-        response['Content-Disposition'] = f'attachment; filename="{original_filename}"'
+        response['Content-Disposition'] = content_disposition_header(True, original_filename)
         response['Content-Length'] = len(decrypted_content)
 
         log_vault_action(request, 'file_download', success=True, item_type='file', item_id=file_obj.id)
@@ -814,10 +826,14 @@ class APIKeyListView(VaultRequiredMixin, ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        queryset = VaultAPIKey.objects.filter(user=self.request.user)
+        return VaultAPIKey.objects.filter(user=self.request.user)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
         dek = VaultSessionManager.get_dek_from_session(self.request)
 
-        for item in queryset:
+        # Decrypt only the items on the current page
+        for item in context['object_list']:
             try:
                 item.decrypted_name = VaultCryptoService.decrypt_field(item.name, dek)
                 item.decrypted_service_name = VaultCryptoService.decrypt_field(item.service_name, dek)
@@ -825,7 +841,7 @@ class APIKeyListView(VaultRequiredMixin, ListView):
                 item.decrypted_name = '[Decryption Error]'
                 item.decrypted_service_name = '[Decryption Error]'
 
-        return queryset
+        return context
 
 
 class APIKeyDetailView(VaultRequiredMixin, DetailView):